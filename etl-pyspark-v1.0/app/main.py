@@ -3,10 +3,8 @@ import os
 import sys
 import logging
 import shutil
-import platform
-from multiprocessing import Pool
+import tempfile
 from pathlib import Path
-import subprocess
 import multiprocessing as mp
 
 # Add component app directories to sys.path
@@ -25,11 +23,13 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - [%
 logger = logging.getLogger(__name__)
 
 # Default paths (relative to project root)
-SLICES_DIR = "chunks_dir"
-INPUT_DIR = "source_dir"
 RESULTS_DIR = "task_results_dir"
 OUTPUT_DIR = "output_dir"
 
+# Slices are scratch data; keep them on tmpfs when it has room for them
+SHM_DIR = "/dev/shm"
+MIN_SHM_FREE_BYTES = 2 * 1024 ** 3
+
 # Default parameters and metadata
 DEFAULT_PARAMS = {
     "chunk_size": 5000,
@@ -67,49 +67,36 @@ def clear_directory(dir_path: str) -> None:
                 logger.warning(f"Failed to remove {file_path}: {e}")
         logger.debug(f"Cleared directory: {dir_path}")
 
+def create_scratch_dir() -> str:
+    parent = None
+    if os.path.ismount(SHM_DIR):
+        stat = os.statvfs(SHM_DIR)
+        if stat.f_bavail * stat.f_frsize >= MIN_SHM_FREE_BYTES:
+            parent = SHM_DIR
+    scratch_dir = tempfile.mkdtemp(prefix="etl-pyspark-", dir=parent)
+    logger.debug(f"Created scratch directory: {scratch_dir}")
+    return scratch_dir
+
 def check_environment() -> None:
     logger.debug(f"Environment variables: {dict(os.environ)}")
     for var in ['BYTENITE_API_KEY', 'TASK_ID', 'INPUT_PATH', 'OUTPUT_PATH']:
         if var in os.environ:
             logger.warning(f"Found distributed env var {var}={os.environ[var]}. Unsetting for local run.")
             del os.environ[var]
-    system = platform.system().lower()
+    if os.environ.get('ETL_KILL_STRAY_JVMS') != '1':
+        return
     try:
-        if system == 'windows':
-            result = subprocess.run(['tasklist'], capture_output=True, text=True)
-            if 'java.exe' in result.stdout.lower():
-                logger.warning("Found running Java processes. Terminating them...")
-                subprocess.run(['taskkill', '/F', '/IM', 'java.exe'], capture_output=True, text=True)
-        else:
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            if 'spark' in result.stdout.lower() or 'java' in result.stdout.lower():
-                logger.warning("Found running Spark/Java processes. Terminating them...")
-                subprocess.run(['killall', 'java'], capture_output=True, text=True)
-                subprocess.run(['killall', 'spark'], capture_output=True, text=True, check=False)
+        import psutil
+        for proc in psutil.process_iter(['name']):
+            if proc.info['name'] in ('java', 'java.exe', 'spark'):
+                logger.warning(f"Found running {proc.info['name']} process {proc.pid}. Terminating it...")
+                try:
+                    proc.kill()
+                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                    logger.warning(f"Failed to terminate process {proc.pid}: {e}")
     except Exception as e:
         logger.error(f"Failed to check or terminate processes: {e}")
 
-def process_chunk(args):
-    slice_file, index, slices_dir, input_dir, results_dir = args
-    logger.info(f"Processing slice {index + 1}: {slice_file}")
-    input_path = os.path.join(input_dir, f'data_{index}.bin')
-    slice_path = os.path.join(slices_dir, slice_file)
-    try:
-        shutil.copy(slice_path, input_path)
-        logger.debug(f"Copied {slice_path} to {input_path}")
-        run(input_path=input_path, task_id=str(index), output_dir=results_dir)
-        return True
-    except Exception as e:
-        logger.error(f"Failed to process slice {slice_file}: {e}")
-        raise
-    finally:
-        if os.path.exists(input_path):
-            try:
-                os.remove(input_path)
-                logger.debug(f"Removed temporary input file: {input_path}")
-            except Exception as e:
-                logger.warning(f"Failed to remove {input_path}: {e}")
-
 def main():
     basepath = str(Path(os.path.dirname(__file__)).parent.parent)
     logger.info(f"Using base path: {basepath}")
@@ -125,33 +112,30 @@ def main():
         params['num_threads'] = DEFAULT_PARAMS['num_threads']
     logger.info(f"Task parameters: {params}")
     logger.info(f"Task metadata: {metadata}")
+    scratch_dir = create_scratch_dir()
     try:
-        for dir_path in [SLICES_DIR, INPUT_DIR, RESULTS_DIR, OUTPUT_DIR]:
+        for dir_path in [RESULTS_DIR, OUTPUT_DIR]:
             dir_path = os.path.join(basepath, dir_path)
             os.makedirs(dir_path, exist_ok=True)
             clear_directory(dir_path)
             logger.debug(f"Created/cleared directory: {dir_path}")
         logger.info(f"Partitioning dataset from {params['dataset_url']} into slices...")
+        slices_dir = os.path.join(scratch_dir, 'slices')
         partitioner(
             data_url=params['dataset_url'],
             chunk_size=params['chunk_size'],
-            output_dir=os.path.join(basepath, SLICES_DIR)
+            output_dir=slices_dir
         )
-        slices_dir = os.path.join(basepath, SLICES_DIR)
         slice_files = [f for f in os.listdir(slices_dir) if f.endswith('.parquet')]
         if not slice_files:
             logger.error("No slices found in slices directory.")
             raise ValueError("No slices found to process.")
         logger.info(f"Found {len(slice_files)} slices to process with {params['num_threads']} threads.")
-        chunk_args = [
-            (slice_file, i, slices_dir, os.path.join(basepath, INPUT_DIR), os.path.join(basepath, RESULTS_DIR))
-            for i, slice_file in enumerate(slice_files)
-        ]
-        with Pool(processes=params['num_threads']) as pool:
-            results = pool.map(process_chunk, chunk_args)
-        if not all(results):
-            logger.error("Some chunks failed to process.")
-            raise RuntimeError("Parallel processing failed for some chunks.")
+        run(
+            input_paths=[os.path.join(slices_dir, slice_file) for slice_file in slice_files],
+            output_dir=os.path.join(basepath, RESULTS_DIR),
+            num_threads=params['num_threads']
+        )
         logger.info("Assembling results into final Parquet file...")
         assembler(
             input_dir=os.path.join(basepath, RESULTS_DIR),
@@ -162,6 +146,8 @@ def main():
         logger.error(f"Pipeline failed: {e}")
         raise
     finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        logger.debug(f"Removed scratch directory: {scratch_dir}")
         for var in ['INPUT_PATH', 'OUTPUT_PATH', 'TASK_ID']:
             os.environ.pop(var, None)
 
@@ -2,16 +2,16 @@ import os
 import logging
 import platform
 from pyspark.sql import SparkSession
-from pyspark.sql.functions import col, to_timestamp, unix_timestamp, hour, when, concat_ws, lit
+from pyspark.sql.functions import col, to_timestamp, unix_timestamp, hour, when, format_string
 from pyspark.sql.types import IntegerType
 from pyspark.sql import DataFrame
-import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - [%(processName)s] - %(message)s")
 logger = logging.getLogger(__name__)
 
-def get_spark_session() -> SparkSession:
+def get_spark_session(num_threads: int = 2) -> SparkSession:
     system = platform.system().lower()
     temp_dir = str(Path(f"/tmp/spark-{os.getpid()}")) if system != 'windows' else str(Path(os.getenv('TEMP', 'C:\\Temp')) / f"spark-{os.getpid()}")
     try:
@@ -19,12 +19,20 @@ def get_spark_session() -> SparkSession:
             .appName(f"NYCTaxiETLLocal-{os.getpid()}") \
             .config("spark.driver.memory", "1g") \
             .config("spark.executor.memory", "1g") \
-            .config("spark.default.parallelism", "2") \
-            .config("spark.sql.shuffle.partitions", "2") \
+            .config("spark.default.parallelism", str(num_threads)) \
+            .config("spark.sql.shuffle.partitions", str(num_threads)) \
             .config("spark.ui.enabled", "false") \
             .config("spark.driver.host", "localhost") \
             .config("spark.local.dir", temp_dir) \
-            .master("local[2]") \
+            .config("spark.sql.parquet.enableVectorizedReader", "true") \
+            .config("spark.sql.parquet.columnarReaderBatchSize", "4096") \
+            .config("spark.sql.parquet.filterPushdown", "true") \
+            .config("spark.sql.inMemoryColumnarStorage.batchSize", "8192") \
+            .config("spark.sql.files.maxPartitionBytes", "16m") \
+            .config("spark.sql.parquet.compression.codec", "zstd") \
+            .config("spark.io.compression.codec", "zstd") \
+            .config("spark.io.compression.zstd.level", "1") \
+            .master(f"local[{num_threads}]") \
             .getOrCreate()
         logger.debug("Spark session created successfully.")
         return spark
@@ -32,16 +40,16 @@ def get_spark_session() -> SparkSession:
         logger.error(f"Failed to create Spark session: {e}")
         raise
 
-def extract(spark: SparkSession, input_path: str) -> DataFrame:
-    input_path = str(Path(input_path))
-    logger.debug(f"Attempting to read Parquet file from: {input_path}")
-    if not os.path.exists(input_path):
-        logger.error(f"Input file not found: {input_path}")
-        raise FileNotFoundError(f"Input file not found: {input_path}")
+def extract(spark: SparkSession, input_paths: list) -> DataFrame:
+    logger.debug(f"Attempting to read {len(input_paths)} Parquet files")
+    for input_path in input_paths:
+        if not os.path.exists(input_path):
+            logger.error(f"Input file not found: {input_path}")
+            raise FileNotFoundError(f"Input file not found: {input_path}")
     try:
-        df = spark.read.parquet(input_path)
-        row_count = df.count()
-        logger.info(f"Chunk loaded successfully with {row_count} rows.")
+        df = spark.read.parquet(*input_paths)
+        row_count = sum(pq.read_metadata(input_path).num_rows for input_path in input_paths)
+        logger.info(f"Loaded {len(input_paths)} slices with {row_count} rows.")
         return df
     except Exception as e:
         logger.error(f"Failed to read Parquet file: {e}")
@@ -51,84 +59,59 @@ def transform(df: DataFrame) -> DataFrame:
     try:
         logger.debug("Starting data transformation...")
         df = df.na.drop()
-        df = df.withColumn("tpep_pickup_datetime", to_timestamp(col("tpep_pickup_datetime")))
-        df = df.withColumn("tpep_dropoff_datetime", to_timestamp(col("tpep_dropoff_datetime")))
-        df = df.withColumn(
-            "trip_duration",
-            (unix_timestamp(col("tpep_dropoff_datetime")) - unix_timestamp(col("tpep_pickup_datetime"))) / 60
+        pickup = to_timestamp(col("tpep_pickup_datetime"))
+        dropoff = to_timestamp(col("tpep_dropoff_datetime"))
+        trip_duration = (unix_timestamp(dropoff) - unix_timestamp(pickup)) / 60
+        pickup_hour = hour(pickup)
+        columns = [
+            pickup.alias(name) if name == "tpep_pickup_datetime"
+            else dropoff.alias(name) if name == "tpep_dropoff_datetime"
+            else col(name)
+            for name in df.columns
+        ]
+        df = df.select(
+            *columns,
+            trip_duration.alias("trip_duration"),
+            when(trip_duration != 0, col("trip_distance") / (trip_duration / 60)).otherwise(None).alias("speed_mph"),
+            (col("PULocationID").between(1, 3) | col("DOLocationID").between(1, 3)).alias("is_airport_trip"),
+            when(col("fare_amount") != 0, (col("tip_amount") / col("fare_amount")) * 100).otherwise(None).alias("tip_percentage"),
+            when(col("trip_distance") != 0, col("total_amount") / col("trip_distance")).otherwise(None).alias("cost_per_mile"),
+            pickup_hour.alias("pickup_hour"),
+            when((pickup_hour.between(7, 9)) | (pickup_hour.between(17, 19)), True).otherwise(False).alias("is_peak_hour"),
+            format_string(
+                "Trip from location %d to %d with %d passenger(s), covering %s miles in %s minutes.",
+                col("PULocationID"),
+                col("DOLocationID"),
+                col("passenger_count").cast(IntegerType()),
+                col("trip_distance"),
+                trip_duration
+            ).alias("trip_summary")
         )
-        df = df.withColumn(
-            "speed_mph",
-            when(col("trip_duration") != 0, col("trip_distance") / (col("trip_duration") / 60)).otherwise(None)
-        )
-        df = df.withColumn(
-            "is_airport_trip",
-            col("PULocationID").isin([1, 2, 3]) | col("DOLocationID").isin([1, 2, 3])
-        )
-        df = df.withColumn(
-            "tip_percentage",
-            when(col("fare_amount") != 0, (col("tip_amount") / col("fare_amount")) * 100).otherwise(None)
-        )
-        df = df.withColumn(
-            "cost_per_mile",
-            when(col("trip_distance") != 0, col("total_amount") / col("trip_distance")).otherwise(None)
-        )
-        df = df.withColumn("pickup_hour", hour(col("tpep_pickup_datetime")))
-        df = df.withColumn(
-            "is_peak_hour",
-            when((col("pickup_hour").between(7, 9)) | (col("pickup_hour").between(17, 19)), True).otherwise(False)
-        )
-        df = df.withColumn(
-            "trip_summary",
-            concat_ws(
-                " ",
-                lit("Trip from location"),
-                col("PULocationID").cast("string"),
-                lit("to"),
-                col("DOLocationID").cast("string"),
-                lit("with"),
-                col("passenger_count").cast(IntegerType()).cast("string"),
-                lit("passenger(s), covering"),
-                col("trip_distance").cast("string"),
-                lit("miles in"),
-                col("trip_duration").cast("string"),
-                lit("minutes.")
-            )
-        )
-        row_count = df.count()
-        logger.debug(f"Transformation completed. Output rows: {row_count}")
+        logger.debug("Transformation completed.")
         return df
     except Exception as e:
         logger.error(f"Transformation error: {e}")
         raise
 
 def load(df: DataFrame, output_path: str) -> None:
-    output_path = str(Path(output_path))
     logger.debug(f"Writing results to: {output_path}")
     try:
-        result_df = df.toPandas()
-        result_str = result_df.to_string(index=False)
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w') as f:
-            f.write("\n--- Chunk Results ---\n")
-            f.write(result_str)
-            f.write("\n")
+        df.write.mode("overwrite").parquet(output_path)
         logger.info(f"Results written to {output_path}")
     except Exception as e:
         logger.error(f"Failed to write results: {e}")
         raise
 
-def run(input_path: str, task_id: str, output_dir: str) -> None:
+def run(input_paths: list, output_dir: str, num_threads: int = 2) -> None:
     logger.info("Starting ETL task...")
     spark = None
     try:
-        spark = get_spark_session()
-        output_path = os.path.join(output_dir, f"chunk_result_{task_id}.txt")
-        logger.info(f"Input path: {input_path}")
-        logger.info(f"Output path: {output_path}")
-        df = extract(spark, input_path)
+        spark = get_spark_session(num_threads)
+        logger.info(f"Input paths: {len(input_paths)} slices")
+        logger.info(f"Output path: {output_dir}")
+        df = extract(spark, input_paths)
         df = transform(df)
-        load(df, output_path)
+        load(df, output_dir)
         logger.info("ETL task completed.")
     except Exception as e:
         logger.error(f"ETL task failed: {e}")
@@ -143,8 +126,9 @@ def run(input_path: str, task_id: str, output_dir: str) -> None:
                 logger.error(f"Failed to stop Spark session: {e}")
 
 if __name__ == "__main__":
+    input_dir = os.getenv("INPUT_PATH", "../../chunks_dir")
     run(
-        input_path=os.getenv("INPUT_PATH", "../../source_dir/data.bin"),
-        task_id=os.getenv("TASK_ID", "0"),
-        output_dir=os.getenv("OUTPUT_PATH", "../../task_results_dir")
+        input_paths=[os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.endswith(".parquet")],
+        output_dir=os.getenv("OUTPUT_PATH", "../../task_results_dir"),
+        num_threads=int(os.getenv("NUM_THREADS", "2"))
     )
\ No newline at end of file
@@ -1,39 +1,40 @@
 import os
-import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 import logging
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - [%(processName)s] - %(message)s")
 logger = logging.getLogger(__name__)
 
+def read_result_file(file_path: str) -> pa.Table | None:
+    try:
+        table = pq.read_table(file_path, memory_map=True)
+        if table.num_rows > 0:
+            logger.debug(f"Read {file_path} with {table.num_rows} rows")
+            return table
+        logger.warning(f"Empty table from {file_path}, skipping")
+    except Exception as e:
+        logger.warning(f"Failed to read {file_path}: {e}, skipping")
+    return None
+
 def assembler(input_dir: str, output_path: str) -> None:
-    input_dir = str(Path(input_dir))
-    output_path = str(Path(output_path))
     logger.debug(f"Merging results from {input_dir}")
     try:
-        result_dfs = []
-        for filename in os.listdir(input_dir):
-            if filename.startswith("chunk_result_") and filename.endswith(".txt"):
-                file_path = os.path.join(input_dir, filename)
-                try:
-                    df = pd.read_csv(file_path, skiprows=2, skipfooter=1, engine='python')
-                    if not df.empty:
-                        result_dfs.append(df)
-                        logger.debug(f"Read {file_path} with {len(df)} rows")
-                    else:
-                        logger.warning(f"Empty dataframe from {file_path}, skipping")
-                except Exception as e:
-                    logger.warning(f"Failed to read {file_path}: {e}, skipping")
-        if not result_dfs:
+        with os.scandir(input_dir) as entries:
+            file_paths = [
+                entry.path for entry in entries
+                if entry.name.startswith("part-") and entry.name.endswith(".parquet") and entry.is_file(follow_symlinks=False)
+            ]
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            tables = [table for table in executor.map(read_result_file, file_paths) if table is not None]
+        if not tables:
             logger.error("No valid result files found")
             raise ValueError("No valid result files to assemble")
-        combined_df = pd.concat(result_dfs, ignore_index=True)
-        logger.info(f"Combined {len(result_dfs)} result files with {len(combined_df)} rows")
-        table = pa.Table.from_pandas(combined_df)
+        table = pa.concat_tables(tables, promote_options="default")
+        logger.info(f"Combined {len(tables)} result files with {table.num_rows} rows")
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        pq.write_table(table, output_path, compression="zstd")
+        pq.write_table(table, output_path, compression="zstd", use_dictionary=True, data_page_size=1 << 20)
         logger.info(f"Saved Parquet file to {output_path}")
     except Exception as e:
         logger.error(f"Error assembling results: {e}")
@@ -44,4 +45,4 @@ if __name__ == "__main__":
         "input_dir": os.getenv("RESULTS_DIR", "../../task_results_dir"),
         "output_path": os.getenv("OUTPUT_PATH", "../../output_dir/result.parquet")
     }
-    assembler(**task_params)
\ No newline at end of file
+    assembler(**task_params)
@@ -1,15 +1,19 @@
 import pyarrow.parquet as pq
 import pyarrow as pa
 import requests
-import io
+import tempfile
 import logging
 import platform
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - [%(processName)s] - %(message)s")
 logger = logging.getLogger(__name__)
 
+RANGE_SIZE = 8 * 1024 * 1024
+DOWNLOAD_THREADS = 8
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 def check_environment():
     logger.info(f"Python version: {platform.python_version()}")
     logger.info(f"Architecture: {platform.machine()}")
@@ -21,8 +25,56 @@ def check_environment():
         logger.error("PyArrow is not installed. Install with: pip install pyarrow")
         raise
 
+def fetch_range(data_url: str, file_path: str, start: int, end: int) -> None:
+    response = requests.get(data_url, headers={"Range": f"bytes={start}-{end}"}, timeout=30)
+    response.raise_for_status()
+    if response.status_code != 206:
+        raise ValueError(f"Server ignored range request bytes={start}-{end}")
+    if len(response.content) != end - start + 1:
+        raise ValueError(f"Short range response for bytes={start}-{end}: got {len(response.content)} bytes")
+    with open(file_path, "r+b") as f:
+        f.seek(start)
+        f.write(response.content)
+    logger.debug(f"Fetched bytes {start}-{end}")
+
+def download_ranges(data_url: str, file_path: str) -> bool:
+    try:
+        head = requests.head(data_url, allow_redirects=True, timeout=30)
+        head.raise_for_status()
+        content_length = int(head.headers.get("Content-Length", 0))
+        if head.headers.get("Accept-Ranges") != "bytes" or content_length == 0:
+            logger.info("Server does not support range requests, streaming download")
+            return False
+        logger.info(f"Downloading {content_length} bytes in {RANGE_SIZE} byte ranges")
+        with open(file_path, "r+b") as f:
+            f.truncate(content_length)
+        ranges = [(start, min(start + RANGE_SIZE, content_length) - 1) for start in range(0, content_length, RANGE_SIZE)]
+        executor = ThreadPoolExecutor(max_workers=DOWNLOAD_THREADS)
+        try:
+            futures = [executor.submit(fetch_range, data_url, file_path, start, end) for start, end in ranges]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return True
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Range download failed ({e}), streaming download")
+        return False
+
+def download(data_url: str, file_path: str) -> None:
+    if download_ranges(data_url, file_path):
+        return
+    try:
+        response = requests.get(data_url, stream=True, timeout=30)
+        response.raise_for_status()
+        with open(file_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                f.write(chunk)
+    except requests.RequestException as e:
+        logger.error(f"Error fetching data: {e}")
+        raise
+
 def partitioner(data_url: str, chunk_size: int, output_dir: str) -> None:
-    output_dir = str(Path(output_dir))
     check_environment()
     logger.debug(f"Fetching data from: {data_url}")
     logger.debug(f"Output directory: {output_dir}")
@@ -32,33 +84,28 @@ def partitioner(data_url: str, chunk_size: int, output_dir: str) -> None:
     except OSError as e:
         logger.error(f"Cannot create output directory {output_dir}: {e}")
         raise
+    with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as f:
+        download_path = f.name
     try:
-        response = requests.get(data_url, stream=True, timeout=30)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching data: {e}")
-        raise
-    parquet_buffer = io.BytesIO()
-    for chunk in response.iter_content(chunk_size=8192):
-        parquet_buffer.write(chunk)
-    parquet_buffer.seek(0)
-    if parquet_buffer.getbuffer().nbytes == 0:
-        logger.error("Downloaded Parquet file is empty")
-        raise ValueError("Downloaded Parquet file is empty")
-    logger.debug("Reading Parquet file in chunks")
-    try:
-        table = pq.read_table(parquet_buffer)
-        total_rows = table.num_rows
-        logger.info(f"Total rows: {total_rows}")
-        for offset in range(0, total_rows, chunk_size):
-            rows_to_read = min(chunk_size, total_rows - offset)
-            slice_table = table.slice(offset, rows_to_read)
-            slice_path = os.path.join(output_dir, f"slice_{offset // chunk_size}.parquet")
-            pq.write_table(slice_table, slice_path, compression="zstd")
-            logger.debug(f"Saved slice of {slice_table.num_rows} rows to {slice_path}")
-    except Exception as e:
-        logger.error(f"Error processing Parquet file: {e}")
-        raise
+        download(data_url, download_path)
+        if os.path.getsize(download_path) == 0:
+            logger.error("Downloaded Parquet file is empty")
+            raise ValueError("Downloaded Parquet file is empty")
+        logger.debug("Reading Parquet file in chunks")
+        try:
+            with pq.ParquetFile(download_path, memory_map=True) as parquet_file:
+                logger.info(f"Total rows: {parquet_file.metadata.num_rows}")
+                batches = parquet_file.iter_batches(batch_size=chunk_size, use_threads=True)
+                for index, batch in enumerate(batches):
+                    slice_table = pa.Table.from_batches([batch])
+                    slice_path = os.path.join(output_dir, f"slice_{index}.parquet")
+                    pq.write_table(slice_table, slice_path, compression=None, write_statistics=False)
+                    logger.debug(f"Saved slice of {slice_table.num_rows} rows to {slice_path}")
+        except Exception as e:
+            logger.error(f"Error processing Parquet file: {e}")
+            raise
+    finally:
+        os.remove(download_path)
 
 if __name__ == "__main__":
     task_params = {
@@ -25,13 +25,12 @@ for script in "${SLICER_SCRIPT}" "${ETL_SCRIPT}" "${ASSEMBLER_SCRIPT}"; do
 done
 
 # Define directories
-SOURCE_DIR="${PROJECT_ROOT}/source_dir"
 CHUNKS_DIR="${PROJECT_ROOT}/chunks_dir"
 TASK_RESULTS_DIR="${PROJECT_ROOT}/task_results_dir"
 OUTPUT_DIR="${PROJECT_ROOT}/output_dir"
 
 # Create and set permissions for directories
-for dir in "${SOURCE_DIR}" "${CHUNKS_DIR}" "${TASK_RESULTS_DIR}" "${OUTPUT_DIR}"; do
+for dir in "${CHUNKS_DIR}" "${TASK_RESULTS_DIR}" "${OUTPUT_DIR}"; do
     if [ ! -d "${dir}" ]; then
         echo "Creating directory: ${dir}"
         mkdir -p "${dir}"
@@ -48,7 +47,6 @@ export PARTITIONER_PARAMS='{}'
 
 ## App environment variables
 export TASK_DIR="${CHUNKS_DIR}"
-export INPUT_DIR="${SOURCE_DIR}"
 export TASK_RESULTS_DIR="${TASK_RESULTS_DIR}"
 export OUTPUT_DIR="${OUTPUT_DIR}"
 export APP_PARAMS='{"chunk_size": 5000, "dataset_url": "https://storage.googleapis.com/video-test-public/yellow_tripdata_2024-01.parquet", "num_threads": 4}'
@@ -69,7 +67,6 @@ echo "Running with environment variables:"
 echo "  DATA_URL=${DATA_URL}"
 echo "  CHUNK_SIZE=${CHUNK_SIZE}"
 echo "  SLICE_DIR=${SLICE_DIR}"
-echo "  INPUT_DIR=${INPUT_DIR}"
 echo "  TASK_DIR=${TASK_DIR}"
 echo "  TASK_RESULTS_DIR=${TASK_RESULTS_DIR}"
 echo "  OUTPUT_DIR=${OUTPUT_DIR}"
@@ -78,7 +75,7 @@ echo "  PYTHONPATH=${PYTHONPATH}"
 
 # Clear existing directories
 echo "Clearing directories..."
-rm -rf "${CHUNKS_DIR}/*" "${SOURCE_DIR}/*" "${TASK_RESULTS_DIR}/*" "${OUTPUT_DIR}/*" 2>/dev/null || true
+rm -rf "${CHUNKS_DIR}/*" "${TASK_RESULTS_DIR}/*" "${OUTPUT_DIR}/*" 2>/dev/null || true
 
 # Run slicer and check output
 echo "Running parquet slicer..."
@@ -112,7 +109,7 @@ echo "Output file generated: ${OUTPUT_DIR}/result.parquet"
 echo "Pipeline completed successfully. Output: ${OUTPUT_DIR}/result.parquet"
 
 # Clean up environment variables
-unset DATA_URL CHUNK_SIZE SLICE_DIR INPUT_DIR TASK_DIR TASK_RESULTS_DIR OUTPUT_DIR OUTPUT_PATH PARTITIONER_PARAMS APP_PARAMS ASSEMBLER_PARAMS
+unset DATA_URL CHUNK_SIZE SLICE_DIR TASK_DIR TASK_RESULTS_DIR OUTPUT_DIR OUTPUT_PATH PARTITIONER_PARAMS APP_PARAMS ASSEMBLER_PARAMS
 export PYTHONPATH="${PYTHONPATH#${PROJECT_ROOT}/parquet-slicer-v1.0/app:${PROJECT_ROOT}/parquet-assembler-v1.0/app:${PROJECT_ROOT}/etl-pyspark-v1.0/app:}"
 
 echo "Environment variables cleaned up."